@@ -1,77 +1,280 @@
+import contextlib
+import functools
+import hashlib
+import io
+import itertools
 import json
+import multiprocessing
+import os
 import random
+import shutil
+import sys
+import time
 import warnings
-from collections import defaultdict
+from collections import defaultdict, deque
+from datetime import date, timedelta
+from importlib.metadata import version
+from pathlib import Path
 
 import click
 from faker import Faker
+from faker.config import AVAILABLE_LOCALES
+
+from ftm_random.stats import StatsCollector
 
 # Suppress the warning message from requests, which is very cautious with
 # newer versions of urllib3 and chardet. Must be set before importing
 # anything that pulls in requests.
 warnings.filterwarnings("ignore", message="urllib3", module="requests")
 
-from followthemoney import model  # noqa: E402
-
 fake = Faker()
 
-# Generators for each FTM property type
+# Seeded runs end their date ranges here instead of today, so the same seed
+# gives the same output on any day.
+SEED_REFERENCE_DATE = date(2025, 1, 1)
+_reference_date = None
+
+
+def _date_between(faker, years):
+    """Random ISO date within the given number of years before the reference."""
+    end = _reference_date or date.today()
+    start = end - timedelta(days=round(365.25 * years))
+    return faker.date_between(start_date=start, end_date=end).isoformat()
+
+
+# Bump when the layout of the cached schema metadata changes.
+SCHEMA_CACHE_FORMAT = 1
+
+# Generators for each FTM property type, called with the Faker instance
+# for the locale of the entity being generated.
 TYPE_GENERATORS = {
-    "name": lambda: fake.name(),
-    "string": lambda: fake.word(),
-    "date": lambda: fake.date_between(start_date="-80y", end_date="today").isoformat(),
-    "country": lambda: fake.country_code().lower(),
-    "identifier": lambda: fake.bothify("???-########"),
-    "gender": lambda: random.choice(["male", "female", "other"]),
-    "number": lambda: str(random.randint(1, 999)),
-    "language": lambda: fake.language_code(),
-    "email": lambda: fake.email(),
-    "phone": lambda: fake.phone_number(),
-    "url": lambda: fake.url(),
-    "address": lambda: fake.address().replace("\n", ", "),
-    "text": lambda: fake.sentence(),
-    "topic": lambda: random.choice(
+    "name": lambda f: f.name(),
+    "string": lambda f: f.word(),
+    "date": lambda f: _date_between(f, 80),
+    "country": lambda f: f.country_code().lower(),
+    "identifier": lambda f: f.bothify("???-########"),
+    "gender": lambda f: random.choice(["male", "female", "other"]),
+    "number": lambda f: str(random.randint(1, 999)),
+    "language": lambda f: f.language_code(),
+    "email": lambda f: f.email(),
+    "phone": lambda f: f.phone_number(),
+    "url": lambda f: f.url(),
+    "address": lambda f: f.address().replace("\n", ", "),
+    "text": lambda f: f.sentence(),
+    "topic": lambda f: random.choice(
         ["role.pep", "role.rca", "sanction", "crime", "fin.bank"]
     ),
-    "entity": lambda: fake.sha1(),
+    "entity": lambda f: f.sha1(),
 }
 
+# Faker methods used by TYPE_GENERATORS and inbox, which a locale must provide
+FAKER_METHODS = (
+    "name",
+    "word",
+    "date_between",
+    "country_code",
+    "bothify",
+    "language_code",
+    "email",
+    "phone_number",
+    "url",
+    "address",
+    "sentence",
+    "paragraph",
+    "sha1",
+    "uuid4",
+)
+
 # Properties to skip (internal-use fields)
 SKIP_PROPERTIES = {"indexText"}
 
 
+@functools.cache
+def get_faker(locale=None):
+    """Return the Faker instance for a locale, creating it only once."""
+    if locale is None:
+        return fake
+    return Faker(locale)
+
+
+# Faker locales whose suffix is not the ISO code of the country they describe.
+LOCALE_COUNTRIES = {
+    "ar_AA": None,  # Arabic, not tied to a country
+    "en_MS": "my",  # Malaysia, not Montserrat
+    "es_CA": "es",  # Catalan in Spain, not Canada
+    "fr_QC": "ca",  # Quebec
+}
+
+
+@functools.cache
+def _locale_country(locale):
+    """Return the FTM country code implied by a Faker locale (de_DE -> de)."""
+    if locale in LOCALE_COUNTRIES:
+        return LOCALE_COUNTRIES[locale]
+    if locale is None or "_" not in locale:
+        return None
+    from followthemoney import registry
+
+    return registry.country.clean(locale.rsplit("_", 1)[1])
+
+
+def _parse_locales(ctx, param, value):
+    """Click callback: split and validate a comma-separated list of locales."""
+    if value is None:
+        return ()
+    locales = tuple(loc.strip() for loc in value.split(",") if loc.strip())
+    for locale in locales:
+        if locale not in AVAILABLE_LOCALES:
+            raise click.BadParameter(f"Unknown locale: {locale}")
+        faker = get_faker(locale)
+        missing = [m for m in FAKER_METHODS if not hasattr(faker, m)]
+        if missing:
+            raise click.BadParameter(
+                f"Locale {locale} cannot generate: {', '.join(missing)}"
+            )
+    return locales
+
+
+def _pick_locale(locales):
+    """Pick the locale for the next entity, or None for the default locale."""
+    return random.choice(locales) if locales else None
+
+
+@functools.cache
+def get_model():
+    """Load the followthemoney model on first use.
+
+    Importing followthemoney parses all schema definitions, which commands
+    that only need schema metadata can skip.
+    """
+    from followthemoney import model
+
+    return model
+
+
+def _cache_dir():
+    """Directory for ftm-random's on-disk caches."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ftm-random"
+
+
+def _build_schema_metadata():
+    """Extract the schema metadata ftm-random needs from the loaded model."""
+    metadata = {}
+    for name, schema in get_model().schemata.items():
+        metadata[name] = {
+            "description": schema.description or "",
+            "edge": schema.edge,
+            "abstract": schema.abstract,
+            "is_a": sorted(s.name for s in schema.schemata),
+            "ranges": {
+                p.name: p.range.name
+                for p in schema.properties.values()
+                if p.range is not None
+            },
+        }
+    return metadata
+
+
+def _cached_schema_metadata():
+    """Read schema metadata from the disk cache, building it on a miss."""
+    ftm_version = version("followthemoney")
+    path = _cache_dir() / f"schemata-v{SCHEMA_CACHE_FORMAT}-{ftm_version}.json"
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        pass
+    metadata = _build_schema_metadata()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as fh:
+            json.dump(metadata, fh)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # A read-only cache directory only costs the rebuild.
+    return metadata
+
+
+@functools.cache
+def schema_metadata():
+    """Schema metadata by schema name, cached on disk per followthemoney version.
+
+    Each entry holds the description, the edge and abstract flags, the set of
+    schemata it is a subtype of (including itself) and the range of each
+    entity-type property. The disk cache is skipped when FTM_MODEL_PATH
+    points to a custom model.
+    """
+    if os.environ.get("FTM_MODEL_PATH"):
+        # A custom model can change without a followthemoney release, so
+        # there is no version to key a disk cache on.
+        metadata = _build_schema_metadata()
+    else:
+        metadata = _cached_schema_metadata()
+    for meta in metadata.values():
+        meta["is_a"] = frozenset(meta["is_a"])
+    return metadata
+
+
+def _concrete_schemata():
+    """Names of all non-abstract schemata."""
+    return [name for name, meta in schema_metadata().items() if not meta["abstract"]]
+
+
 def _pick_entity_id(prop, entity_pool):
     """Pick a random entity ID from the pool that matches the property's range."""
     range_schema = prop.range
     if range_schema is None:
         return None
-    candidates = []
+    metadata = schema_metadata()
+    # Index into the compatible ID lists instead of concatenating them, which
+    # would copy the whole pool for every pick.
+    compatible = []
+    total = 0
     for schema_name, ids in entity_pool.items():
-        schema = model.get(schema_name)
-        if schema is not None and schema.is_a(range_schema):
-            candidates.extend(ids)
-    if candidates:
-        return random.choice(candidates)
-    return None
+        meta = metadata.get(schema_name)
+        if meta is not None and range_schema.name in meta["is_a"]:
+            compatible.append(ids)
+            total += len(ids)
+    if not total:
+        return None
+    index = random.randrange(total)
+    for ids in compatible:
+        if index < len(ids):
+            return ids[index]
+        index -= len(ids)
 
 
-def generate_random_entity(schema_name, entity_pool=None):
+def generate_random_entity(schema_name, entity_pool=None, locale=None, overrides=None):
+    model = get_model()
     schema = model.get(schema_name)
     if schema is None:
         raise click.ClickException(f"Unknown schema: {schema_name}")
 
     entity = model.make_entity(schema_name)
 
+    # All locale-dependent values of one entity come from the same locale, and
+    # country-type properties agree with it when the locale names a country.
+    faker = get_faker(locale)
+    country = _locale_country(locale)
+
     settable = [
         p
         for p in schema.properties.values()
         if not p.stub and p.name not in SKIP_PROPERTIES
     ]
 
+    overrides = overrides or {}
     for prop in settable:
         is_required = prop.name in schema.required
         type_name = prop.type.name
 
+        # Values fixed by the caller, e.g. the links of a scenario graph
+        if prop.name in overrides:
+            entity.add(prop, overrides[prop.name])
+            continue
+
         # For entity-type properties in connected mode, wire to real entities
         if type_name == "entity" and entity_pool is not None:
             entity_id = _pick_entity_id(prop, entity_pool)
@@ -79,27 +282,373 @@ def generate_random_entity(schema_name, entity_pool=None):
                 entity.add(prop, entity_id)
             continue
 
-        # Always set name-type and required properties
-        if type_name == "name" or is_required:
-            gen = TYPE_GENERATORS.get(type_name)
-            if gen:
-                entity.add(prop, gen())
-            continue
-
-        # Set other properties with some probability
-        if random.random() < 0.4:
+        # Always set name-type and required properties, others with some
+        # probability
+        if type_name == "name" or is_required or random.random() < 0.4:
+            if type_name == "country" and country is not None:
+                entity.add(prop, country)
+                continue
             gen = TYPE_GENERATORS.get(type_name)
             if gen:
-                entity.add(prop, gen())
+                # Phone numbers come in national format, the country tells
+                # followthemoney which dialing prefix to apply.
+                fmt = country if type_name == "phone" else None
+                entity.add(prop, gen(faker), format=fmt)
 
     entity.make_id(fake.uuid4())
     schema.validate(entity.to_dict())
     return entity
 
 
+def _split_node_edge(choices, command):
+    """Split schema names into node and edge schemata, requiring both."""
+    metadata = schema_metadata()
+    node_schemata = []
+    edge_schemata = []
+    for name in choices:
+        meta = metadata.get(name)
+        if meta is None:
+            raise click.ClickException(f"Unknown schema: {name}")
+        if meta["edge"]:
+            edge_schemata.append(name)
+        else:
+            node_schemata.append(name)
+
+    if not edge_schemata:
+        raise click.ClickException(
+            f"{command} requires at least one edge schema "
+            "(e.g. Directorship, Ownership, Associate)."
+        )
+    if not node_schemata:
+        raise click.ClickException(
+            f"{command} requires at least one non-edge schema (e.g. Person, Company)."
+        )
+    return node_schemata, edge_schemata
+
+
+class _Tee(io.TextIOBase):
+    """Text stream that writes to several streams at once."""
+
+    def __init__(self, *streams):
+        self.streams = streams
+
+    def write(self, text):
+        for stream in self.streams:
+            stream.write(text)
+        return len(text)
+
+    def flush(self):
+        for stream in self.streams:
+            if not stream.closed:
+                stream.flush()
+
+
+# Options that only change how output is generated, not the output itself.
+UNKEYED_PARAMS = frozenset({"workers"})
+
+
+def _fixture_key(command, params, seed):
+    """Content address for the output of one command invocation."""
+    key = {
+        "command": command,
+        "params": {k: v for k, v in params.items() if k not in UNKEYED_PARAMS},
+        "seed": seed,
+        "reference_date": SEED_REFERENCE_DATE.isoformat(),
+        "ftm-random": version("ftm-random"),
+        "followthemoney": version("followthemoney"),
+        "faker": version("faker"),
+    }
+    data = json.dumps(key, sort_keys=True, default=list)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _evict_fixtures(directory, max_size):
+    """Delete least recently used fixtures until the cache fits max_size."""
+    fixtures = sorted(directory.glob("*.jsonl"), key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in fixtures)
+    for path in fixtures:
+        if total <= max_size:
+            break
+        total -= path.stat().st_size
+        path.unlink(missing_ok=True)
+
+
+def cached_fixture(func):
+    """Serve a command's output from the fixture cache when --cache is set.
+
+    The first invocation writes its output through to the cache, repeat
+    invocations with the same options, seed and package versions stream
+    the cached JSONL instead of generating it again. The cache is skipped
+    when FTM_MODEL_PATH points to a custom model.
+    """
+
+    @functools.wraps(func)
+    def wrapper(**params):
+        ctx = click.get_current_context()
+        root = ctx.find_root().params
+        # Like the schema metadata cache, a custom model has no version
+        # that could go into the key.
+        if not root.get("cache") or os.environ.get("FTM_MODEL_PATH"):
+            return func(**params)
+
+        outfile = params.pop("outfile")
+        out = outfile or sys.stdout
+        directory = _cache_dir() / "fixtures"
+        path = (
+            directory / f"{_fixture_key(ctx.command.name, params, root['seed'])}.jsonl"
+        )
+        try:
+            with open(path) as fh:
+                shutil.copyfileobj(fh, out)
+        except FileNotFoundError:
+            pass
+        else:
+            os.utime(path)  # Mark as recently used for eviction.
+            return None
+
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp, "w") as fh:
+                result = func(outfile=_Tee(out, fh), **params)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        _evict_fixtures(directory, root["cache_max_size"])
+        return result
+
+    return wrapper
+
+
+class PartitionedWriter(io.TextIOBase):
+    """Text stream that spreads JSONL records over many files in a directory.
+
+    Files are named with a running sequence number, so reading them in name
+    order preserves the order in which they were started, e.g. nodes before
+    edges. A file is written under a .part suffix and renamed once it is
+    complete, so loaders can pick up finished files while generation
+    continues. When generation fails, unfinished files are deleted.
+
+    A file is complete when it reaches --max-records or --max-file-size,
+    when the command finishes its partition, or when the writer is closed.
+    Only connected generates one schema at a time and finishes each schema
+    partition when it moves on; other commands interleave schemata, so
+    without size limits their files stay .part until the end of the run.
+    """
+
+    def __init__(self, outdir, partition_by="none", max_records=None, max_size=None):
+        self.outdir = Path(outdir)
+        self.outdir.mkdir(parents=True, exist_ok=True)
+        self.partition_by = partition_by
+        self.max_records = max_records
+        self.max_size = max_size
+        self._files = {}
+        self._sequence = 0
+        self._pending = ""
+
+    def write(self, text):
+        lines = (self._pending + text).split("\n")
+        self._pending = lines.pop()
+        for line in lines:
+            if line:
+                self._write_record(line)
+        return len(text)
+
+    def _partition(self, line):
+        if self.partition_by == "schema":
+            return json.loads(line)["schema"]
+        return "entities"
+
+    def _write_record(self, line):
+        partition = self._partition(line)
+        current = self._files.get(partition)
+        if current is None:
+            current = self._files[partition] = self._open(partition)
+        data = f"{line}\n"
+        size = len(data.encode("utf-8"))
+        fh, path, records, written = current
+        full = (self.max_records is not None and records >= self.max_records) or (
+            self.max_size is not None and records and written + size > self.max_size
+        )
+        if full:
+            self._finish(fh, path)
+            fh, path, records, written = self._open(partition)
+        fh.write(data)
+        self._files[partition] = (fh, path, records + 1, written + size)
+
+    def _open(self, partition):
+        path = self.outdir / f"{self._sequence:05d}-{partition}.jsonl"
+        self._sequence += 1
+        fh = open(path.with_name(path.name + ".part"), "w")
+        return fh, path, 0, 0
+
+    def _finish(self, fh, path):
+        fh.close()
+        os.replace(fh.name, path)
+
+    def finish(self, partition):
+        """Finish the open file of a partition that gets no more records."""
+        current = self._files.pop(partition, None)
+        if current is not None:
+            self._finish(*current[:2])
+
+    def flush(self):
+        for fh, *_ in self._files.values():
+            fh.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        if self._pending:
+            self._write_record(self._pending)
+            self._pending = ""
+        for fh, path, *_ in self._files.values():
+            self._finish(fh, path)
+        self._files = {}
+        super().close()
+
+    def abort(self):
+        """Close the writer, discarding files that were not complete yet."""
+        for fh, *_ in self._files.values():
+            fh.close()
+            os.unlink(fh.name)
+        self._files = {}
+        self._pending = ""
+        super().close()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+def _write_stats(collector, outfile, outdir):
+    """Write the statistics summary next to the output, or to STDERR."""
+    summary = json.dumps(collector.summary(), indent=2)
+    if outdir is not None:
+        path = Path(outdir) / "stats.json"
+    elif outfile is not None and not outfile.name.startswith("<"):
+        path = Path(f"{outfile.name}.stats.json")
+    else:
+        click.echo(summary, err=True)
+        return
+    path.write_text(summary + "\n")
+
+
+def _finish_partition(partition):
+    """Tell the --outdir writer, if any, that a partition is complete."""
+    writer = click.get_current_context().meta.get("ftm_random.writer")
+    if writer is not None:
+        writer.finish(partition)
+
+
+def output_options(func):
+    """Add --outdir, its partitioning options and --stats to a command."""
+
+    @functools.wraps(func)
+    def wrapper(outdir, partition_by, max_records, max_file_size, stats, **params):
+        outfile = params["outfile"]
+        if outdir is not None and outfile is not None:
+            raise click.UsageError("--outfile and --outdir are mutually exclusive.")
+        if outdir is not None and Path(outdir).is_dir() and any(Path(outdir).iterdir()):
+            # Files of an earlier run would be mixed with the new ones.
+            raise click.UsageError(f"--outdir {outdir} is not empty.")
+        with contextlib.ExitStack() as stack:
+            if outdir is not None:
+                writer = stack.enter_context(
+                    PartitionedWriter(
+                        outdir,
+                        partition_by=partition_by,
+                        max_records=max_records,
+                        max_size=max_file_size,
+                    )
+                )
+                # The command only sees outfile, which may be wrapped for
+                # --cache or --stats, so share the writer via the context.
+                click.get_current_context().meta["ftm_random.writer"] = writer
+                params["outfile"] = writer
+            if not stats:
+                return func(**params)
+            collector = StatsCollector(
+                params["outfile"] or sys.stdout, schema_metadata()
+            )
+            result = func(**{**params, "outfile": collector})
+            _write_stats(collector, outfile, outdir)
+            return result
+
+    options = [
+        click.option(
+            "--outdir",
+            default=None,
+            type=click.Path(file_okay=False),
+            help="Write JSONL files into this new or empty directory "
+            "instead of one stream.",
+        ),
+        click.option(
+            "--partition-by",
+            "partition_by",
+            default="none",
+            type=click.Choice(["none", "schema"]),
+            help="Split --outdir output into separate files per schema. "
+            "connected finishes each file once its schema is done, other "
+            "commands only when they end or a file reaches its limits.",
+        ),
+        click.option(
+            "--max-records",
+            "max_records",
+            default=None,
+            type=click.IntRange(min=1),
+            help="Start a new --outdir file after this many entities.",
+        ),
+        click.option(
+            "--max-file-size",
+            "max_file_size",
+            default=None,
+            type=click.IntRange(min=1),
+            help="Start a new --outdir file before exceeding this many bytes.",
+        ),
+        click.option(
+            "--stats",
+            is_flag=True,
+            default=False,
+            help="Write a statistics summary next to the output (STDERR for STDOUT).",
+        ),
+    ]
+    for option in reversed(options):
+        wrapper = option(wrapper)
+    return wrapper
+
+
 @click.group()
-def cli():
+@click.option(
+    "--seed",
+    default=None,
+    type=int,
+    help="Seed the random generators for reproducible output.",
+)
+@click.option(
+    "--cache",
+    is_flag=True,
+    default=False,
+    help="Reuse the output of earlier runs with the same options (needs --seed).",
+)
+@click.option(
+    "--cache-max-size",
+    "cache_max_size",
+    default=1024**3,
+    type=click.IntRange(min=0),
+    help="Maximum size of the fixture cache in bytes.",
+)
+def cli(seed, cache, cache_max_size):
     """Generate random followthemoney entities."""
+    global _reference_date
+    if cache and seed is None:
+        raise click.UsageError("--cache requires --seed.")
+    _reference_date = None if seed is None else SEED_REFERENCE_DATE
+    if seed is not None:
+        random.seed(seed)
+        Faker.seed(seed)
 
 
 @cli.command()
@@ -124,13 +673,23 @@ def cli():
     default=False,
     help="Use a random schema for each entity.",
 )
+@click.option(
+    "--locales",
+    "locales",
+    default=None,
+    callback=_parse_locales,
+    help="Comma-separated Faker locales to draw entities from (e.g. de_DE,fr_FR).",
+)
 @click.option(
     "--outfile",
     "outfile",
     default=None,
+    type=click.File("w"),
     help="JSONL output file (leave this out for STDOUT)",
 )
-def entities(count, count_per_schema, schemata, random_schema, outfile):
+@output_options
+@cached_fixture
+def entities(count, count_per_schema, schemata, random_schema, locales, outfile):
     """Generate random followthemoney entities."""
     if count_per_schema is not None and random_schema:
         raise click.ClickException(
@@ -138,20 +697,20 @@ def entities(count, count_per_schema, schemata, random_schema, outfile):
         )
 
     if random_schema:
-        choices = [
-            name for name, schema in model.schemata.items() if not schema.abstract
-        ]
+        choices = _concrete_schemata()
     else:
         choices = list(schemata)
 
     if count_per_schema is not None:
         for schema_name in choices:
             for _ in range(count_per_schema):
-                ent = generate_random_entity(schema_name)
+                ent = generate_random_entity(schema_name, locale=_pick_locale(locales))
                 click.echo(message=json.dumps(ent.to_dict()), file=outfile)
     else:
         for _ in range(count):
-            ent = generate_random_entity(random.choice(choices))
+            ent = generate_random_entity(
+                random.choice(choices), locale=_pick_locale(locales)
+            )
             click.echo(message=json.dumps(ent.to_dict()), file=outfile)
 
 
@@ -177,13 +736,23 @@ def entities(count, count_per_schema, schemata, random_schema, outfile):
     default=False,
     help="Use a random schema for each entity.",
 )
+@click.option(
+    "--locales",
+    "locales",
+    default=None,
+    callback=_parse_locales,
+    help="Comma-separated Faker locales to draw entities from (e.g. de_DE,fr_FR).",
+)
 @click.option(
     "--outfile",
     "outfile",
     default=None,
+    type=click.File("w"),
     help="JSONL output file (leave this out for STDOUT)",
 )
-def connected(count, count_per_schema, schemata, random_schema, outfile):
+@output_options
+@cached_fixture
+def connected(count, count_per_schema, schemata, random_schema, locales, outfile):
     """Generate connected random followthemoney entities.
 
     Link edge entities (e.g. Directorship) to other generated entities.
@@ -194,34 +763,13 @@ def connected(count, count_per_schema, schemata, random_schema, outfile):
         )
 
     if random_schema:
-        choices = [
-            name for name, schema in model.schemata.items() if not schema.abstract
-        ]
+        choices = _concrete_schemata()
     else:
         choices = list(schemata)
 
     # Separate node and edge schemata, generate nodes first,
     # then wire edge entities to real node IDs.
-    node_schemata = []
-    edge_schemata = []
-    for name in choices:
-        schema = model.get(name)
-        if schema is None:
-            raise click.ClickException(f"Unknown schema: {name}")
-        if schema.edge:
-            edge_schemata.append(name)
-        else:
-            node_schemata.append(name)
-
-    if not edge_schemata:
-        raise click.ClickException(
-            "connected requires at least one edge schema "
-            "(e.g. Directorship, Ownership, Associate)."
-        )
-    if not node_schemata:
-        raise click.ClickException(
-            "connected requires at least one non-edge schema (e.g. Person, Company)."
-        )
+    node_schemata, edge_schemata = _split_node_edge(choices, "connected")
 
     # Determine per-schema counts.
     all_schemata = node_schemata + edge_schemata
@@ -239,15 +787,94 @@ def connected(count, count_per_schema, schemata, random_schema, outfile):
     entity_pool = defaultdict(list)
     for schema_name in node_schemata:
         for _ in range(schema_counts[schema_name]):
-            ent = generate_random_entity(schema_name)
+            ent = generate_random_entity(schema_name, locale=_pick_locale(locales))
             entity_pool[schema_name].append(ent.id)
             click.echo(message=json.dumps(ent.to_dict()), file=outfile)
+        _finish_partition(schema_name)
 
     # Generate edge entities wired to the node pool
     for schema_name in edge_schemata:
         for _ in range(schema_counts[schema_name]):
-            ent = generate_random_entity(schema_name, entity_pool=entity_pool)
+            ent = generate_random_entity(
+                schema_name, entity_pool=entity_pool, locale=_pick_locale(locales)
+            )
             click.echo(message=json.dumps(ent.to_dict()), file=outfile)
+        _finish_partition(schema_name)
+
+
+# Owner and contact addresses shared read-only by the inbox workers
+_inbox_directory = None
+
+
+def _init_inbox_worker(owner_email, emails_only, reference_date):
+    """Install the address directory once per worker process."""
+    global _inbox_directory, _reference_date
+    _inbox_directory = (owner_email, emails_only)
+    _reference_date = reference_date
+
+
+def _generate_email(owner_email, emails_only):
+    """Generate one Email entity with the owner among its participants."""
+    email_entity = get_model().make_entity("Email")
+
+    # Subject with reply/forward probabilities
+    base_subject = fake.sentence(nb_words=random.randint(3, 8)).rstrip(".")
+    r = random.random()
+    if r < 0.70:
+        subject = f"Re: {base_subject}"
+    elif r < 0.85:
+        subject = f"Fwd: {base_subject}"
+    else:
+        subject = base_subject
+    email_entity.add("subject", subject)
+
+    email_entity.add("date", _date_between(fake, 5))
+    email_entity.add("bodyText", fake.paragraph())
+
+    # Owner appears in From, To, or Cc of every email
+    owner_role = random.choice(["from", "to", "cc"])
+    email_entity.add(owner_role, owner_email)
+
+    # 75%: between two entities; 25%: more participants
+    if random.random() < 0.75:
+        other = random.choice(emails_only)
+        if owner_role == "from":
+            email_entity.add("to", other)
+        elif owner_role == "to":
+            email_entity.add("from", other)
+        else:  # cc: need someone in both from and to
+            other2 = random.choice(emails_only)
+            email_entity.add("from", other)
+            email_entity.add("to", other2)
+    else:
+        num_others = random.randint(2, min(5, len(emails_only)))
+        others = random.sample(emails_only, num_others)
+        assigned_from = owner_role == "from"
+        assigned_to = owner_role == "to"
+        for addr in others:
+            if not assigned_from:
+                email_entity.add("from", addr)
+                assigned_from = True
+            elif not assigned_to:
+                email_entity.add("to", addr)
+                assigned_to = True
+            else:
+                email_entity.add(random.choice(["to", "cc"]), addr)
+
+    email_entity.make_id(fake.uuid4())
+    return email_entity
+
+
+def _email_chunk(chunk):
+    """Generate a chunk of serialized emails from its (seed, size) pair."""
+    seed, size = chunk
+    random.seed(seed)
+    Faker.seed(seed)
+    owner_email, emails_only = _inbox_directory
+    return [
+        json.dumps(_generate_email(owner_email, emails_only).to_dict())
+        for _ in range(size)
+    ]
 
 
 @cli.command()
@@ -257,28 +884,53 @@ def connected(count, count_per_schema, schemata, random_schema, outfile):
     default=10,
     help="Number of contact Person entities.",
 )
+@click.option(
+    "--workers",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of processes generating emails.",
+)
+@click.option(
+    "--chunk-size",
+    "chunk_size",
+    default=1000,
+    type=click.IntRange(min=1),
+    help="Number of emails per unit of work.",
+)
+@click.option(
+    "--locales",
+    "locales",
+    default=None,
+    callback=_parse_locales,
+    help="Comma-separated Faker locales to draw entities from (e.g. de_DE,fr_FR).",
+)
 @click.option(
     "--outfile",
     "outfile",
     default=None,
+    type=click.File("w"),
     help="JSONL output file (leave this out for STDOUT)",
 )
-def inbox(count, contacts, outfile):
+@output_options
+@cached_fixture
+def inbox(count, contacts, workers, chunk_size, locales, outfile):
     """Generate a realistic email inbox for one Person entity.
 
     Generates one owner Person, a set of contact Persons, and Email entities
     where the owner appears in the From, To, or Cc field of every email.
     """
     # Generate the owner Person with a fixed email address
-    owner = generate_random_entity("Person")
-    owner_email = fake.email()
+    owner_locale = _pick_locale(locales)
+    owner = generate_random_entity("Person", locale=owner_locale)
+    owner_email = get_faker(owner_locale).email()
     click.echo(message=json.dumps(owner.to_dict()), file=outfile)
 
     # Generate contact Persons with email addresses
     contact_emails = []
     for _ in range(contacts):
-        contact = generate_random_entity("Person")
-        contact_emails.append((contact, fake.email()))
+        contact_locale = _pick_locale(locales)
+        contact = generate_random_entity("Person", locale=contact_locale)
+        contact_emails.append((contact, get_faker(contact_locale).email()))
         click.echo(message=json.dumps(contact.to_dict()), file=outfile)
 
     if not contact_emails:
@@ -286,58 +938,314 @@ def inbox(count, contacts, outfile):
 
     emails_only = [e for _, e in contact_emails]
 
-    # Generate Email entities
-    for _ in range(count):
-        email_entity = model.make_entity("Email")
-
-        # Subject with reply/forward probabilities
-        base_subject = fake.sentence(nb_words=random.randint(3, 8)).rstrip(".")
-        r = random.random()
-        if r < 0.70:
-            subject = f"Re: {base_subject}"
-        elif r < 0.85:
-            subject = f"Fwd: {base_subject}"
-        else:
-            subject = base_subject
-        email_entity.add("subject", subject)
+    # Generate Email entities in chunks, each with its own seed drawn up
+    # front so the output does not depend on the number of workers.
+    chunks = [
+        (random.getrandbits(64), min(chunk_size, count - offset))
+        for offset in range(0, count, chunk_size)
+    ]
+    initargs = (owner_email, emails_only, _reference_date)
+    if workers == 1:
+        _init_inbox_worker(*initargs)
+        for lines in map(_email_chunk, chunks):
+            click.echo(message="\n".join(lines), file=outfile)
+    else:
+        with multiprocessing.Pool(
+            workers, initializer=_init_inbox_worker, initargs=initargs
+        ) as pool:
+            for lines in pool.imap(_email_chunk, chunks):
+                click.echo(message="\n".join(lines), file=outfile)
 
-        email_entity.add(
-            "date", fake.date_between(start_date="-5y", end_date="today").isoformat()
+
+def _stream_entities(node_schemata, edge_schemata, window, locales):
+    """Endless serialized entities, edges linking to recently emitted nodes."""
+    metadata = schema_metadata()
+    # The ranges of the required entity properties of each edge schema;
+    # an edge is only emitted once the pool can fill all of them.
+    endpoints = {}
+    for name in edge_schemata:
+        ranges = metadata[name]["ranges"]
+        required = [p for p in get_model().get(name).required if p in ranges]
+        for prop in required:
+            if not any(ranges[prop] in metadata[n]["is_a"] for n in node_schemata):
+                raise click.ClickException(
+                    f"{name}:{prop} needs a node schema of type {ranges[prop]}."
+                )
+        endpoints[name] = [ranges[prop] for prop in required]
+
+    def linkable(name):
+        return all(
+            any(range_name in metadata[n]["is_a"] for n in entity_pool)
+            for range_name in endpoints[name]
         )
-        email_entity.add("bodyText", fake.paragraph())
-
-        # Owner appears in From, To, or Cc of every email
-        owner_role = random.choice(["from", "to", "cc"])
-        email_entity.add(owner_role, owner_email)
-
-        # 75%: between two entities; 25%: more participants
-        if random.random() < 0.75:
-            other = random.choice(emails_only)
-            if owner_role == "from":
-                email_entity.add("to", other)
-            elif owner_role == "to":
-                email_entity.add("from", other)
-            else:  # cc: need someone in both from and to
-                other2 = random.choice(emails_only)
-                email_entity.add("from", other)
-                email_entity.add("to", other2)
-        else:
-            num_others = random.randint(2, min(5, len(emails_only)))
-            others = random.sample(emails_only, num_others)
-            assigned_from = owner_role == "from"
-            assigned_to = owner_role == "to"
-            for addr in others:
-                if not assigned_from:
-                    email_entity.add("from", addr)
-                    assigned_from = True
-                elif not assigned_to:
-                    email_entity.add("to", addr)
-                    assigned_to = True
-                else:
-                    email_entity.add(random.choice(["to", "cc"]), addr)
-
-        email_entity.make_id(fake.uuid4())
-        click.echo(message=json.dumps(email_entity.to_dict()), file=outfile)
+
+    choices = node_schemata + edge_schemata
+    # Keep only the most recent node IDs around so memory stays flat
+    # on long-running streams.
+    entity_pool = defaultdict(lambda: deque(maxlen=window))
+    while True:
+        schema_name = random.choice(choices)
+        if schema_name in edge_schemata and not linkable(schema_name):
+            schema_name = random.choice(node_schemata)
+        ent = generate_random_entity(
+            schema_name,
+            entity_pool=entity_pool if schema_name in edge_schemata else None,
+            locale=_pick_locale(locales),
+        )
+        if schema_name in node_schemata:
+            entity_pool[schema_name].append(ent.id)
+        yield json.dumps(ent.to_dict())
+
+
+@cli.command()
+@click.option(
+    "--rate",
+    default=100.0,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Target throughput in entities per second.",
+)
+@click.option(
+    "--burst",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of entities emitted back-to-back per tick.",
+)
+@click.option(
+    "--count",
+    default=None,
+    type=int,
+    help="Stop after this many entities (default: run until interrupted).",
+)
+@click.option(
+    "--duration",
+    default=None,
+    type=float,
+    help="Stop after this many seconds.",
+)
+@click.option(
+    "--schema",
+    "schemata",
+    default=("Person", "Company", "Directorship"),
+    multiple=True,
+    help="FTM schema name (can be specified multiple times).",
+)
+@click.option(
+    "--window",
+    default=1000,
+    type=click.IntRange(min=1),
+    help="Number of recent node IDs per schema that edges may link to.",
+)
+@click.option(
+    "--locales",
+    "locales",
+    default=None,
+    callback=_parse_locales,
+    help="Comma-separated Faker locales to draw entities from (e.g. de_DE,fr_FR).",
+)
+@click.option(
+    "--outfile",
+    "outfile",
+    default="-",
+    type=click.File("w"),
+    help="JSONL output file (leave this out for STDOUT)",
+)
+def stream(rate, burst, count, duration, schemata, window, locales, outfile):
+    """Emit a continuous stream of connected entities at a fixed rate.
+
+    Every tick emits --burst entities and flushes the output; ticks are paced
+    against absolute deadlines so that the average rate does not drift, and
+    after a stall the stream catches up by at most one tick. Edge entities
+    only link to nodes that were already emitted. The achieved throughput is
+    reported on STDERR.
+    """
+    node_schemata, edge_schemata = _split_node_edge(schemata, "stream")
+    entities = _stream_entities(node_schemata, edge_schemata, window, locales)
+    # Generate the first entity before starting the clock, so loading the
+    # model and Faker providers does not count as lag.
+    entities = itertools.chain([next(entities)], entities)
+    interval = burst / rate
+    emitted = 0
+    start = time.perf_counter()
+    deadline = start
+    try:
+        while count is None or emitted < count:
+            if duration is not None and time.perf_counter() - start >= duration:
+                break
+            tick = burst if count is None else min(burst, count - emitted)
+            for line in itertools.islice(entities, tick):
+                click.echo(message=line, file=outfile)
+            outfile.flush()
+            emitted += tick
+
+            # After a stall, catch up by at most one tick instead of
+            # emitting everything that fell behind at once.
+            now = time.perf_counter()
+            deadline = max(deadline, now - interval) + interval
+            delay = deadline - now
+            if delay > 0:
+                time.sleep(delay)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        elapsed = time.perf_counter() - start
+        achieved = emitted / elapsed if elapsed > 0 else 0.0
+        click.echo(
+            f"Emitted {emitted} entities in {elapsed:.2f}s "
+            f"({achieved:.1f} entities/sec, target {rate:g})",
+            err=True,
+        )
+
+
+def _scenario_node(schema_name, locale, **overrides):
+    # An empty pool keeps entity-type properties unset unless overridden, so
+    # scenario graphs never reference entities outside the batch.
+    return generate_random_entity(
+        schema_name, entity_pool={}, locale=locale, overrides=overrides
+    )
+
+
+def _ownership(owner, asset, locale):
+    """An Ownership of asset by owner with a plausible percentage."""
+    return _scenario_node(
+        "Ownership",
+        locale,
+        owner=owner.id,
+        asset=asset.id,
+        percentage=str(random.randint(1, 100)),
+    )
+
+
+def _shared_address(locale):
+    """An Address entity plus the properties that place a company there."""
+    address = _scenario_node("Address", locale)
+    text = get_faker(locale).address().replace("\n", ", ")
+    address.set("full", text)
+    return address, {"addressEntity": address.id, "address": text}
+
+
+def _ownership_tree(depth, fanout, size, locale):
+    """A holding company owning subsidiaries, fanout per level, depth levels."""
+    root = _scenario_node("Company", locale)
+    nodes, edges = [root], []
+    level = [root]
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            for _ in range(fanout):
+                child = _scenario_node("Company", locale)
+                next_level.append(child)
+                edges.append(_ownership(parent, child, locale))
+        nodes.extend(next_level)
+        level = next_level
+    return nodes, edges
+
+
+def _director_network(depth, fanout, size, locale):
+    """One Person directing many companies registered at the same address."""
+    address, at_address = _shared_address(locale)
+    director = _scenario_node("Person", locale)
+    nodes, edges = [address, director], []
+    for _ in range(size):
+        company = _scenario_node("Company", locale, **at_address)
+        nodes.append(company)
+        edges.append(
+            _scenario_node(
+                "Directorship",
+                locale,
+                director=director.id,
+                organization=company.id,
+            )
+        )
+    return nodes, edges
+
+
+def _shell_ring(depth, fanout, size, locale):
+    """Companies at one address owning each other in a cycle."""
+    address, at_address = _shared_address(locale)
+    companies = [_scenario_node("Company", locale, **at_address) for _ in range(size)]
+    edges = [
+        _ownership(company, companies[(i + 1) % size], locale)
+        for i, company in enumerate(companies)
+    ]
+    return [address, *companies], edges
+
+
+def _sanctions_path(depth, fanout, size, locale):
+    """A sanctioned Person owning a company through a chain of intermediaries."""
+    person = _scenario_node("Person", locale, topics="sanction")
+    sanction = _scenario_node("Sanction", locale, entity=person.id)
+    nodes, edges = [person, sanction], []
+    owner = person
+    for _ in range(depth):
+        company = _scenario_node("Company", locale)
+        nodes.append(company)
+        edges.append(_ownership(owner, company, locale))
+        owner = company
+    return nodes, edges
+
+
+SCENARIOS = {
+    "ownership-tree": _ownership_tree,
+    "director-network": _director_network,
+    "shell-ring": _shell_ring,
+    "sanctions-path": _sanctions_path,
+}
+
+
+@cli.command()
+@click.option(
+    "--type",
+    "scenario_type",
+    default="ownership-tree",
+    type=click.Choice(sorted(SCENARIOS)),
+    help="Kind of subgraph to generate.",
+)
+@click.option("--count", default=1, help="Number of subgraphs to generate.")
+@click.option(
+    "--depth",
+    default=3,
+    type=click.IntRange(min=1),
+    help="Levels of an ownership tree, or hops of a sanctions path.",
+)
+@click.option(
+    "--fanout",
+    default=2,
+    type=click.IntRange(min=1),
+    help="Subsidiaries per company in an ownership tree.",
+)
+@click.option(
+    "--size",
+    default=5,
+    type=click.IntRange(min=2),
+    help="Companies in a director network or shell-company ring.",
+)
+@click.option(
+    "--locales",
+    "locales",
+    default=None,
+    callback=_parse_locales,
+    help="Comma-separated Faker locales to draw entities from (e.g. de_DE,fr_FR).",
+)
+@click.option(
+    "--outfile",
+    "outfile",
+    default=None,
+    type=click.File("w"),
+    help="JSONL output file (leave this out for STDOUT)",
+)
+@output_options
+@cached_fixture
+def scenario(scenario_type, count, depth, fanout, size, locales, outfile):
+    """Generate structured subgraphs such as ownership trees.
+
+    Each subgraph is emitted as one batch, nodes before edges, and every
+    entity reference points to an entity within the same batch.
+    """
+    build = SCENARIOS[scenario_type]
+    for _ in range(count):
+        nodes, edges = build(depth, fanout, size, _pick_locale(locales))
+        for ent in nodes + edges:
+            click.echo(message=json.dumps(ent.to_dict()), file=outfile)
 
 
 @cli.command(name="list")
@@ -348,9 +1256,9 @@ def list_schemata():
     header = f"{'Schema':<{col_name}}  {'Type':<{col_type}}  Description"
     click.echo(header)
     click.echo("-" * len(header))
-    for name, schema in sorted(model.schemata.items()):
-        entity_type = "edge" if schema.edge else "node"
-        description = schema.description or ""
+    for name, meta in sorted(schema_metadata().items()):
+        entity_type = "edge" if meta["edge"] else "node"
+        description = meta["description"]
         click.echo(f"{name:<{col_name}}  {entity_type:<{col_type}}  {description}")
 
 
@@ -0,0 +1,169 @@
+"""Constant-memory statistics over a stream of generated entities."""
+
+import hashlib
+import io
+import json
+import math
+from collections import Counter, defaultdict
+
+
+def _hash64(value):
+    """Stable 64-bit hash of a string."""
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """Estimate the number of distinct values with 2**p one-byte registers."""
+
+    def __init__(self, p=10):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add(self, value):
+        h = _hash64(value)
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        self.registers[index] = max(self.registers[index], rank)
+
+    def estimate(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m**2 / sum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * self.m and zeros:
+            # Linear counting is more accurate for small cardinalities.
+            return round(self.m * math.log(self.m / zeros))
+        return round(raw)
+
+
+class DegreeSampler:
+    """Track the degree of a bounded, hash-sampled subset of nodes.
+
+    A node is sampled when the hash of its ID is below a threshold. Whenever
+    the sample outgrows max_size the threshold is halved and nodes above it
+    are dropped, so every node keeps the same chance of being sampled.
+    """
+
+    def __init__(self, max_size=10_000):
+        self.max_size = max_size
+        self.threshold = 1 << 64
+        self.degrees = {}
+
+    def add_node(self, entity_id):
+        h = _hash64(entity_id)
+        if h >= self.threshold:
+            return
+        self.degrees[entity_id] = (h, 0)
+        while len(self.degrees) > self.max_size:
+            self.threshold >>= 1
+            self.degrees = {
+                k: v for k, v in self.degrees.items() if v[0] < self.threshold
+            }
+
+    def add_reference(self, entity_id):
+        entry = self.degrees.get(entity_id)
+        if entry is not None:
+            self.degrees[entity_id] = (entry[0], entry[1] + 1)
+
+    def summary(self):
+        """Degree histogram in power-of-two buckets over the sampled nodes."""
+        histogram = Counter()
+        for _, degree in self.degrees.values():
+            if degree < 2:
+                histogram[str(degree)] += 1
+            else:
+                low = 1 << (degree.bit_length() - 1)
+                histogram[f"{low}-{2 * low - 1}"] += 1
+        sampled = len(self.degrees)
+        total = sum(degree for _, degree in self.degrees.values())
+        return {
+            "sampled_nodes": sampled,
+            "mean": round(total / sampled, 3) if sampled else 0.0,
+            "histogram": dict(
+                sorted(histogram.items(), key=lambda item: int(item[0].split("-")[0]))
+            ),
+        }
+
+
+class StatsCollector(io.TextIOBase):
+    """Pass JSONL output through while collecting running statistics.
+
+    Counts entities, bytes and properties per schema, estimates distinct
+    entity IDs and distinct values per property, and samples node degrees
+    from entity-type references. Memory use does not grow with the output.
+    """
+
+    def __init__(self, stream, metadata):
+        self.stream = stream
+        self.metadata = metadata
+        self.entities = 0
+        self.bytes = 0
+        self.schemata = defaultdict(Counter)
+        self.ids = HyperLogLog(p=14)
+        self.values = defaultdict(HyperLogLog)
+        self.degrees = DegreeSampler()
+        self._pending = ""
+
+    def write(self, text):
+        self.stream.write(text)
+        lines = (self._pending + text).split("\n")
+        self._pending = lines.pop()
+        for line in lines:
+            if line:
+                self._collect(line)
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def _collect(self, line):
+        entity = json.loads(line)
+        schema = entity["schema"]
+        meta = self.metadata.get(schema, {"edge": False, "ranges": {}})
+        properties = entity.get("properties", {})
+
+        size = len(line.encode("utf-8")) + 1
+        self.entities += 1
+        self.bytes += size
+        counts = self.schemata[schema]
+        counts["count"] += 1
+        counts["bytes"] += size
+        counts["properties"] += len(properties)
+        counts["values"] += sum(len(values) for values in properties.values())
+
+        if entity.get("id"):
+            self.ids.add(entity["id"])
+            if not meta["edge"]:
+                self.degrees.add_node(entity["id"])
+        for name, values in properties.items():
+            is_reference = name in meta["ranges"]
+            for value in values:
+                self.values[name].add(value)
+                if is_reference:
+                    self.degrees.add_reference(value)
+
+    def summary(self):
+        """The collected statistics as a JSON-serializable dict."""
+        if self._pending:
+            self._collect(self._pending)
+            self._pending = ""
+        schemata = {}
+        for schema, counts in sorted(self.schemata.items()):
+            schemata[schema] = {
+                "count": counts["count"],
+                "bytes": counts["bytes"],
+                "avg_properties": round(counts["properties"] / counts["count"], 3),
+                "avg_values": round(counts["values"] / counts["count"], 3),
+            }
+        return {
+            "entities": self.entities,
+            "bytes": self.bytes,
+            "distinct_ids": self.ids.estimate(),
+            "schemata": schemata,
+            "distinct_values": {
+                name: hll.estimate() for name, hll in sorted(self.values.items())
+            },
+            "degree": self.degrees.summary(),
+        }
@@ -0,0 +1,165 @@
+import datetime
+import json
+import os
+from importlib.metadata import version
+
+import pytest
+from click.testing import CliRunner
+
+from ftm_random import main
+from ftm_random.main import cli
+
+runner = CliRunner()
+
+CONNECTED = [
+    "connected",
+    "--schema",
+    "Person",
+    "--schema",
+    "Ownership",
+    "--count",
+    "10",
+]
+
+
+@pytest.fixture
+def fixtures_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path / "ftm-random" / "fixtures"
+
+
+class TestSeed:
+    def test_same_seed_same_output(self):
+        first = runner.invoke(cli, ["--seed", "7", *CONNECTED])
+        second = runner.invoke(cli, ["--seed", "7", *CONNECTED])
+        assert first.exit_code == 0
+        assert first.output == second.output
+
+    def test_same_seed_same_output_on_another_day(self, monkeypatch):
+        args = ["--seed", "7", "inbox", "--count", "20"]
+        today = runner.invoke(cli, args)
+
+        class LaterDate(datetime.date):
+            @classmethod
+            def today(cls):
+                return datetime.date.today() + datetime.timedelta(days=400)
+
+        monkeypatch.setattr(main, "date", LaterDate)
+        later = runner.invoke(cli, args)
+        assert today.exit_code == 0
+        assert today.output == later.output
+
+        dates = [
+            json.loads(line)["properties"]["date"][0]
+            for line in today.output.splitlines()
+            if '"Email"' in line
+        ]
+        assert max(dates) <= main.SEED_REFERENCE_DATE.isoformat()
+
+    def test_unseeded_dates_end_today(self, monkeypatch):
+        class FixedDate(datetime.date):
+            @classmethod
+            def today(cls):
+                return cls(2001, 2, 3)
+
+        monkeypatch.setattr(main, "date", FixedDate)
+        result = runner.invoke(cli, ["inbox", "--count", "20"])
+        assert result.exit_code == 0
+        dates = [
+            json.loads(line)["properties"]["date"][0]
+            for line in result.output.splitlines()
+            if '"Email"' in line
+        ]
+        assert max(dates) <= "2001-02-03"
+
+    def test_different_seed_different_output(self):
+        first = runner.invoke(cli, ["--seed", "7", *CONNECTED])
+        second = runner.invoke(cli, ["--seed", "8", *CONNECTED])
+        assert first.output != second.output
+
+
+class TestFixtureCache:
+    def test_requires_seed(self, fixtures_dir):
+        result = runner.invoke(cli, ["--cache", *CONNECTED])
+        assert result.exit_code != 0
+        assert "--seed" in result.output
+
+    def test_repeat_invocation_served_from_cache(self, fixtures_dir):
+        first = runner.invoke(cli, ["--seed", "1", "--cache", *CONNECTED])
+        assert first.exit_code == 0
+        (path,) = fixtures_dir.glob("*.jsonl")
+        assert path.read_text() == first.output
+
+        # Prove the second run reads the cache rather than regenerating.
+        path.write_text("cached\n")
+        second = runner.invoke(cli, ["--seed", "1", "--cache", *CONNECTED])
+        assert second.exit_code == 0
+        assert second.output == "cached\n"
+
+    def test_key_includes_options_and_seed(self, fixtures_dir):
+        runner.invoke(cli, ["--seed", "1", "--cache", *CONNECTED])
+        runner.invoke(cli, ["--seed", "2", "--cache", *CONNECTED])
+        runner.invoke(cli, ["--seed", "1", "--cache", *CONNECTED, "--count", "5"])
+        assert len(list(fixtures_dir.glob("*.jsonl"))) == 3
+
+    def test_key_ignores_workers(self, fixtures_dir):
+        args = ["--seed", "1", "--cache", "inbox", "--count", "20"]
+        args += ["--chunk-size", "5"]
+        first = runner.invoke(cli, [*args, "--workers", "1"])
+        second = runner.invoke(cli, [*args, "--workers", "2"])
+        assert first.exit_code == 0
+        assert second.output == first.output
+        assert len(list(fixtures_dir.glob("*.jsonl"))) == 1
+
+    def test_key_includes_faker_version(self, fixtures_dir, monkeypatch):
+        runner.invoke(cli, ["--seed", "1", "--cache", *CONNECTED])
+        versions = {"faker": "0.0.1"}
+        monkeypatch.setattr(
+            main, "version", lambda name: versions.get(name) or version(name)
+        )
+        runner.invoke(cli, ["--seed", "1", "--cache", *CONNECTED])
+        assert len(list(fixtures_dir.glob("*.jsonl"))) == 2
+
+    def test_skipped_for_custom_model(self, fixtures_dir, monkeypatch):
+        main.get_model()
+        monkeypatch.setenv("FTM_MODEL_PATH", "/custom/model")
+        result = runner.invoke(cli, ["--seed", "1", "--cache", *CONNECTED])
+        assert result.exit_code == 0
+        assert len(result.output.splitlines()) == 10
+        assert not fixtures_dir.exists()
+
+    def test_cache_writes_outfile(self, fixtures_dir, tmp_path):
+        outfile = tmp_path / "out.jsonl"
+        args = ["--seed", "1", "--cache", *CONNECTED, "--outfile", str(outfile)]
+        for _ in range(2):
+            result = runner.invoke(cli, args)
+            assert result.exit_code == 0
+            assert len(outfile.read_text().splitlines()) == 10
+
+    def test_failed_run_is_not_cached(self, fixtures_dir):
+        result = runner.invoke(
+            cli, ["--seed", "1", "--cache", "inbox", "--contacts", "0"]
+        )
+        assert result.exit_code != 0
+        assert not list(fixtures_dir.glob("*"))
+
+    def test_lru_eviction(self, fixtures_dir):
+        sizes = {}
+        for seed in ("1", "2", "3"):
+            result = runner.invoke(cli, ["--seed", seed, *CONNECTED])
+            sizes[seed] = len(result.output.encode("utf-8"))
+        for seed in ("1", "2"):
+            runner.invoke(cli, ["--seed", seed, "--cache", *CONNECTED])
+        for path in fixtures_dir.glob("*.jsonl"):
+            os.utime(path, (0, 0))
+        # A cache hit on seed 1 makes seed 2 the least recently used.
+        hit = runner.invoke(cli, ["--seed", "1", "--cache", *CONNECTED])
+
+        max_size = sizes["1"] + sizes["3"]
+        runner.invoke(
+            cli,
+            ["--seed", "3", "--cache", "--cache-max-size", str(max_size), *CONNECTED],
+        )
+        remaining = {p.read_text() for p in fixtures_dir.glob("*.jsonl")}
+        assert len(remaining) == 2
+        assert hit.output in remaining
@@ -0,0 +1,41 @@
+import json
+
+from click.testing import CliRunner
+
+from ftm_random.main import cli
+
+runner = CliRunner()
+
+
+def parse_output(result):
+    """Parse JSONL output into a list of entity dicts."""
+    return [json.loads(line) for line in result.output.strip().splitlines()]
+
+
+class TestInbox:
+    def test_counts(self):
+        result = runner.invoke(
+            cli, ["inbox", "--count", "25", "--contacts", "3", "--chunk-size", "7"]
+        )
+        assert result.exit_code == 0
+        schemata = [e["schema"] for e in parse_output(result)]
+        assert schemata.count("Person") == 4
+        assert schemata.count("Email") == 25
+
+    def test_owner_in_every_email(self):
+        result = runner.invoke(cli, ["inbox", "--count", "30", "--chunk-size", "4"])
+        assert result.exit_code == 0
+        emails = [e for e in parse_output(result) if e["schema"] == "Email"]
+        addresses = [
+            set().union(*(e["properties"].get(k, []) for k in ("from", "to", "cc")))
+            for e in emails
+        ]
+        assert set.intersection(*addresses)
+
+    def test_output_independent_of_workers(self):
+        args = ["--seed", "3", "inbox", "--count", "40", "--chunk-size", "6"]
+        sequential = runner.invoke(cli, args)
+        parallel = runner.invoke(cli, [*args, "--workers", "3"])
+        assert sequential.exit_code == 0
+        assert parallel.exit_code == 0
+        assert sequential.output == parallel.output
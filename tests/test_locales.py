@@ -0,0 +1,102 @@
+import json
+
+from click.testing import CliRunner
+from faker.config import AVAILABLE_LOCALES
+
+from ftm_random.main import (
+    LOCALE_COUNTRIES,
+    _locale_country,
+    cli,
+    generate_random_entity,
+    get_faker,
+)
+
+runner = CliRunner()
+
+
+def parse_output(result):
+    """Parse JSONL output into a list of entity dicts."""
+    return [json.loads(line) for line in result.output.strip().splitlines()]
+
+
+class TestGetFaker:
+    def test_instances_are_cached(self):
+        assert get_faker("de_DE") is get_faker("de_DE")
+
+    def test_default_locale(self):
+        assert get_faker() is get_faker(None)
+
+
+class TestLocaleCountry:
+    def test_every_faker_locale(self):
+        for locale in AVAILABLE_LOCALES:
+            if "_" not in locale:
+                continue
+            expected = LOCALE_COUNTRIES.get(locale, locale.split("_")[1].lower())
+            assert _locale_country(locale) == expected, locale
+
+    def test_non_iso_suffixes(self):
+        assert _locale_country("es_CA") == "es"
+        assert _locale_country("fr_CA") == "ca"
+        assert _locale_country("fr_QC") == "ca"
+        assert _locale_country("ar_AA") is None
+
+
+class TestLocaleConsistency:
+    def test_country_properties_follow_locale(self):
+        for _ in range(20):
+            entity = generate_random_entity("Person", locale="fr_FR")
+            props = entity.to_dict()["properties"]
+            for key in ("nationality", "citizenship", "birthCountry", "country"):
+                for value in props.get(key, []):
+                    assert value == "fr"
+
+    def test_phone_numbers_get_locale_prefix(self):
+        phones = []
+        for _ in range(50):
+            entity = generate_random_entity("Person", locale="de_DE")
+            phones.extend(entity.get("phone"))
+        assert phones
+        assert all(phone.startswith("+49") for phone in phones)
+
+
+class TestLocalesCLI:
+    def test_entities_with_locales(self):
+        result = runner.invoke(
+            cli,
+            ["entities", "--count", "20", "--locales", "de_DE,fr_FR"],
+        )
+        assert result.exit_code == 0
+        entities = parse_output(result)
+        assert len(entities) == 20
+        for e in entities:
+            assert set(e["properties"].get("nationality", [])) <= {"de", "fr"}
+
+    def test_connected_with_locales(self):
+        result = runner.invoke(
+            cli,
+            [
+                "connected",
+                "--schema",
+                "Person",
+                "--schema",
+                "Associate",
+                "--count",
+                "6",
+                "--locales",
+                "it_IT",
+            ],
+        )
+        assert result.exit_code == 0
+        assert len(parse_output(result)) == 6
+
+    def test_unknown_locale(self):
+        result = runner.invoke(cli, ["entities", "--locales", "xx_XX"])
+        assert result.exit_code != 0
+        assert "Unknown locale" in result.output
+
+    def test_locale_missing_providers(self):
+        result = runner.invoke(cli, ["entities", "--locales", "de_DE,en_PH"])
+        assert result.exit_code != 0
+        assert "en_PH cannot generate: phone_number" in result.output
+        assert "Traceback" not in result.output
@@ -0,0 +1,183 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from ftm_random import main
+from ftm_random.main import PartitionedWriter, cli
+
+runner = CliRunner()
+
+CONNECTED = [
+    "connected",
+    "--schema",
+    "Person",
+    "--schema",
+    "Company",
+    "--schema",
+    "Directorship",
+    "--count",
+    "30",
+]
+
+
+def read_dir(outdir):
+    """Map file name to the entities in it, in file name order."""
+    return {
+        path.name: [json.loads(line) for line in path.read_text().splitlines()]
+        for path in sorted(outdir.iterdir())
+    }
+
+
+class TestPartitionedWriter:
+    def test_buffers_partial_lines(self, tmp_path):
+        with PartitionedWriter(tmp_path, partition_by="schema") as writer:
+            writer.write('{"id": "a", "schema": "Per')
+            writer.write('son"}\n{"id": "b", "schema": "Company"}\n')
+        assert list(read_dir(tmp_path)) == [
+            "00000-Person.jsonl",
+            "00001-Company.jsonl",
+        ]
+
+    def test_part_suffix_until_complete(self, tmp_path):
+        writer = PartitionedWriter(tmp_path, max_records=1)
+        writer.write('{"id": "a"}\n{"id": "b"}\n')
+        names = sorted(p.name for p in tmp_path.iterdir())
+        assert names == ["00000-entities.jsonl", "00001-entities.jsonl.part"]
+        writer.close()
+        names = sorted(p.name for p in tmp_path.iterdir())
+        assert names == ["00000-entities.jsonl", "00001-entities.jsonl"]
+
+    def test_abort_discards_unfinished_files(self, tmp_path):
+        with (
+            pytest.raises(RuntimeError),
+            PartitionedWriter(tmp_path, max_records=1) as writer,
+        ):
+            writer.write('{"id": "a"}\n{"id": "b"}\n')
+            raise RuntimeError("generation failed")
+        # The rotated file was complete, the open one is discarded.
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["00000-entities.jsonl"]
+
+    def test_finish_partition(self, tmp_path):
+        writer = PartitionedWriter(tmp_path, partition_by="schema")
+        writer.write('{"id": "a", "schema": "Person"}\n')
+        writer.write('{"id": "b", "schema": "Company"}\n')
+        writer.finish("Person")
+        names = sorted(p.name for p in tmp_path.iterdir())
+        assert names == ["00000-Person.jsonl", "00001-Company.jsonl.part"]
+        writer.close()
+
+
+class TestOutdir:
+    def test_single_partition(self, tmp_path):
+        result = runner.invoke(cli, [*CONNECTED, "--outdir", str(tmp_path)])
+        assert result.exit_code == 0
+        assert result.output == ""
+        files = read_dir(tmp_path)
+        assert list(files) == ["00000-entities.jsonl"]
+        assert len(files["00000-entities.jsonl"]) == 30
+
+    def test_partition_by_schema_keeps_nodes_first(self, tmp_path):
+        result = runner.invoke(
+            cli,
+            [*CONNECTED, "--outdir", str(tmp_path), "--partition-by", "schema"],
+        )
+        assert result.exit_code == 0
+        files = read_dir(tmp_path)
+        assert list(files) == [
+            "00000-Person.jsonl",
+            "00001-Company.jsonl",
+            "00002-Directorship.jsonl",
+        ]
+        for name, entities in files.items():
+            assert {e["schema"] for e in entities} == {name[6:-6]}
+
+    def test_connected_finishes_node_files_before_edges(self, tmp_path, monkeypatch):
+        generate = main.generate_random_entity
+        seen = {}
+
+        def watch_generate(schema_name, **kwargs):
+            if schema_name == "Directorship" and not seen:
+                seen.update({p.name: p for p in tmp_path.iterdir()})
+            return generate(schema_name, **kwargs)
+
+        monkeypatch.setattr(main, "generate_random_entity", watch_generate)
+        result = runner.invoke(
+            cli,
+            [*CONNECTED, "--outdir", str(tmp_path), "--partition-by", "schema"],
+        )
+        assert result.exit_code == 0
+        assert sorted(seen) == ["00000-Person.jsonl", "00001-Company.jsonl"]
+
+    def test_max_records(self, tmp_path):
+        result = runner.invoke(
+            cli, [*CONNECTED, "--outdir", str(tmp_path), "--max-records", "7"]
+        )
+        assert result.exit_code == 0
+        sizes = [len(entities) for entities in read_dir(tmp_path).values()]
+        assert sizes == [7, 7, 7, 7, 2]
+
+    def test_max_file_size(self, tmp_path):
+        result = runner.invoke(
+            cli, [*CONNECTED, "--outdir", str(tmp_path), "--max-file-size", "4000"]
+        )
+        assert result.exit_code == 0
+        paths = list(tmp_path.iterdir())
+        assert len(paths) > 1
+        for path in paths:
+            # A single record larger than the limit still gets its own file.
+            lines = path.read_text().splitlines()
+            assert path.stat().st_size <= 4000 or len(lines) == 1
+        assert sum(len(e) for e in read_dir(tmp_path).values()) == 30
+
+    def test_inbox_outdir(self, tmp_path):
+        result = runner.invoke(
+            cli,
+            [
+                "inbox",
+                "--count",
+                "20",
+                "--chunk-size",
+                "6",
+                "--outdir",
+                str(tmp_path),
+                "--partition-by",
+                "schema",
+            ],
+        )
+        assert result.exit_code == 0
+        files = read_dir(tmp_path)
+        assert len(files["00000-Person.jsonl"]) == 11
+        assert len(files["00001-Email.jsonl"]) == 20
+
+    def test_failed_run_leaves_no_finished_files(self, tmp_path):
+        result = runner.invoke(
+            cli, ["inbox", "--contacts", "0", "--outdir", str(tmp_path)]
+        )
+        assert result.exit_code != 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_refuses_non_empty_outdir(self, tmp_path):
+        args = [*CONNECTED, "--outdir", str(tmp_path), "--max-records", "5"]
+        first = runner.invoke(cli, args)
+        assert first.exit_code == 0
+        before = read_dir(tmp_path)
+
+        second = runner.invoke(cli, [*args, "--count", "10"])
+        assert second.exit_code != 0
+        assert "not empty" in second.output
+        assert read_dir(tmp_path) == before
+
+    def test_outfile_and_outdir_exclusive(self, tmp_path):
+        result = runner.invoke(
+            cli,
+            [
+                *CONNECTED,
+                "--outdir",
+                str(tmp_path / "out"),
+                "--outfile",
+                str(tmp_path / "out.jsonl"),
+            ],
+        )
+        assert result.exit_code != 0
+        assert "mutually exclusive" in result.output
@@ -0,0 +1,95 @@
+"""Performance regression tests, run with `pytest -m perf`.
+
+Fixed-seed runs of entities, connected and inbox are compared with the
+baselines in perf_baselines.json. A run fails when it is slower or uses more
+memory than the baseline allows for, with a relative tolerance taken from
+FTM_RANDOM_PERF_TOLERANCE (default 0.3).
+
+Throughput is measured on 100k entities. tracemalloc slows generation down
+several times over, so peak memory is traced on a separate, smaller run.
+
+Throughput baselines depend on the machine. Record them again with
+FTM_RANDOM_PERF_RECORD=1 when changing hardware or after an intended change.
+"""
+
+import json
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from ftm_random.main import cli
+
+runner = CliRunner()
+
+BASELINES = Path(__file__).parent / "perf_baselines.json"
+TOLERANCE = float(os.environ.get("FTM_RANDOM_PERF_TOLERANCE", "0.3"))
+RECORD = os.environ.get("FTM_RANDOM_PERF_RECORD") == "1"
+COUNT = 100_000
+MEMORY_COUNT = 10_000
+
+RUNS = {
+    "entities": ["entities"],
+    "connected": [
+        "connected",
+        "--schema",
+        "Person",
+        "--schema",
+        "Company",
+        "--schema",
+        "Directorship",
+        "--schema",
+        "Ownership",
+    ],
+    "inbox": ["inbox", "--contacts", "100"],
+}
+
+
+def run(name, count, outfile):
+    result = runner.invoke(
+        cli,
+        ["--seed", "42", *RUNS[name], "--count", str(count), "--outfile", outfile],
+    )
+    assert result.exit_code == 0, result.output
+
+
+def check(name, metric, value, higher_is_better):
+    """Compare a measurement with its baseline, or record it."""
+    baselines = json.loads(BASELINES.read_text())
+    if RECORD:
+        baselines.setdefault(name, {})[metric] = round(value, 3)
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        return
+    baseline = baselines[name][metric]
+    if higher_is_better:
+        limit = baseline * (1 - TOLERANCE)
+        assert value >= limit, f"{name}: {metric} {value:.1f} < {limit:.1f}"
+    else:
+        limit = baseline * (1 + TOLERANCE)
+        assert value <= limit, f"{name}: {metric} {value:.1f} > {limit:.1f}"
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("name", sorted(RUNS))
+def test_throughput(name, tmp_path):
+    start = time.perf_counter()
+    run(name, COUNT, str(tmp_path / "out.jsonl"))
+    rate = COUNT / (time.perf_counter() - start)
+    check(name, "entities_per_sec", rate, higher_is_better=True)
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("name", sorted(RUNS))
+def test_peak_memory(name, tmp_path):
+    # Warm up first, so loading the model and Faker providers is not counted.
+    run(name, 100, str(tmp_path / "warmup.jsonl"))
+    tracemalloc.start()
+    try:
+        run(name, MEMORY_COUNT, str(tmp_path / "out.jsonl"))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    check(name, "peak_memory_mb", peak / 1024**2, higher_is_better=False)
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+from followthemoney import model
+
+from ftm_random.main import SCENARIOS, cli
+
+runner = CliRunner()
+
+
+def parse_output(result):
+    """Parse JSONL output into a list of entity dicts."""
+    return [json.loads(line) for line in result.output.strip().splitlines()]
+
+
+def entity_refs(entity):
+    """Yield all values of entity-type properties."""
+    schema = model.get(entity["schema"])
+    for name, values in entity["properties"].items():
+        if schema.get(name).type.name == "entity":
+            yield from values
+
+
+class TestScenario:
+    @pytest.mark.parametrize("scenario_type", sorted(SCENARIOS))
+    def test_referential_integrity(self, scenario_type):
+        result = runner.invoke(
+            cli, ["scenario", "--type", scenario_type, "--count", "3"]
+        )
+        assert result.exit_code == 0
+        entities = parse_output(result)
+        ids = {e["id"] for e in entities}
+        for e in entities:
+            for ref in entity_refs(e):
+                assert ref in ids
+
+    def test_ownership_tree_size(self):
+        result = runner.invoke(
+            cli, ["scenario", "--type", "ownership-tree", "--depth", "2"]
+        )
+        assert result.exit_code == 0
+        schemata = [e["schema"] for e in parse_output(result)]
+        # 1 root + 2 + 4 companies, one Ownership per non-root company
+        assert schemata.count("Company") == 7
+        assert schemata.count("Ownership") == 6
+
+    def test_director_network_shares_address(self):
+        result = runner.invoke(
+            cli, ["scenario", "--type", "director-network", "--size", "4"]
+        )
+        assert result.exit_code == 0
+        entities = parse_output(result)
+        companies = [e for e in entities if e["schema"] == "Company"]
+        assert len(companies) == 4
+        addresses = {c["properties"]["addressEntity"][0] for c in companies}
+        assert len(addresses) == 1
+        directors = {
+            e["properties"]["director"][0]
+            for e in entities
+            if e["schema"] == "Directorship"
+        }
+        assert len(directors) == 1
+
+    def test_shell_ring_is_a_cycle(self):
+        result = runner.invoke(cli, ["scenario", "--type", "shell-ring", "--size", "3"])
+        assert result.exit_code == 0
+        edges = {
+            e["properties"]["owner"][0]: e["properties"]["asset"][0]
+            for e in parse_output(result)
+            if e["schema"] == "Ownership"
+        }
+        start = next(iter(edges))
+        node, steps = edges[start], 1
+        while node != start:
+            node, steps = edges[node], steps + 1
+        assert steps == 3
+
+    def test_sanctions_path_starts_at_sanctioned_person(self):
+        result = runner.invoke(
+            cli, ["scenario", "--type", "sanctions-path", "--depth", "4"]
+        )
+        assert result.exit_code == 0
+        entities = parse_output(result)
+        person = next(e for e in entities if e["schema"] == "Person")
+        assert "sanction" in person["properties"]["topics"]
+        owners = [
+            e["properties"]["owner"][0] for e in entities if e["schema"] == "Ownership"
+        ]
+        assert len(owners) == 4
+        assert owners[0] == person["id"]
+
+    def test_nodes_emitted_before_edges(self):
+        result = runner.invoke(cli, ["scenario", "--type", "ownership-tree"])
+        schemata = [e["schema"] for e in parse_output(result)]
+        assert schemata.index("Ownership") > max(
+            i for i, s in enumerate(schemata) if s == "Company"
+        )
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+from followthemoney import model
+
+from ftm_random.main import schema_metadata
+
+
+@pytest.fixture
+def cache_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    schema_metadata.cache_clear()
+    yield tmp_path
+    schema_metadata.cache_clear()
+
+
+class TestSchemaMetadata:
+    def test_matches_model(self, cache_home):
+        metadata = schema_metadata()
+        assert set(metadata) == set(model.schemata)
+        for name, schema in model.schemata.items():
+            assert metadata[name]["edge"] == schema.edge
+            assert metadata[name]["abstract"] == schema.abstract
+
+    def test_is_a_closure(self, cache_home):
+        is_a = schema_metadata()["Company"]["is_a"]
+        assert {"Company", "Organization", "LegalEntity", "Thing"} <= is_a
+        assert "Person" not in is_a
+
+    def test_property_ranges(self, cache_home):
+        ranges = schema_metadata()["Directorship"]["ranges"]
+        assert ranges["director"] == "LegalEntity"
+        assert ranges["organization"] == "Organization"
+
+    def test_written_to_disk_and_reused(self, cache_home):
+        schema_metadata()
+        (path,) = (cache_home / "ftm-random").glob("schemata-*.json")
+        data = json.loads(path.read_text())
+        data["Person"]["description"] = "from cache"
+        path.write_text(json.dumps(data))
+
+        schema_metadata.cache_clear()
+        assert schema_metadata()["Person"]["description"] == "from cache"
+
+    def test_corrupt_cache_is_rebuilt(self, cache_home):
+        schema_metadata()
+        (path,) = (cache_home / "ftm-random").glob("schemata-*.json")
+        path.write_text("{not json")
+
+        schema_metadata.cache_clear()
+        assert schema_metadata()["Person"]["edge"] is False
+
+    def test_custom_model_path_bypasses_disk_cache(self, cache_home, monkeypatch):
+        schema_metadata()
+        (path,) = (cache_home / "ftm-random").glob("schemata-*.json")
+        data = json.loads(path.read_text())
+        data["Person"]["description"] = "from cache"
+        path.write_text(json.dumps(data))
+
+        monkeypatch.setenv("FTM_MODEL_PATH", "/custom/model")
+        schema_metadata.cache_clear()
+        assert schema_metadata()["Person"]["description"] != "from cache"
+        assert json.loads(path.read_text()) == data
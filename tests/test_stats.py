@@ -0,0 +1,78 @@
+import json
+
+from click.testing import CliRunner
+
+from ftm_random.main import cli
+from ftm_random.stats import DegreeSampler, HyperLogLog
+
+runner = CliRunner()
+
+CONNECTED = [
+    "connected",
+    "--schema",
+    "Person",
+    "--schema",
+    "Associate",
+    "--count",
+    "40",
+]
+
+
+class TestHyperLogLog:
+    def test_small_cardinality(self):
+        hll = HyperLogLog()
+        for i in range(100):
+            hll.add(f"value-{i % 50}")
+        assert 45 <= hll.estimate() <= 55
+
+    def test_large_cardinality(self):
+        hll = HyperLogLog()
+        for i in range(20_000):
+            hll.add(f"value-{i}")
+        assert abs(hll.estimate() - 20_000) < 20_000 * 0.1
+
+
+class TestDegreeSampler:
+    def test_counts_references(self):
+        sampler = DegreeSampler()
+        sampler.add_node("a")
+        sampler.add_node("b")
+        for ref in ("a", "a", "a", "unknown"):
+            sampler.add_reference(ref)
+        summary = sampler.summary()
+        assert summary["sampled_nodes"] == 2
+        assert summary["histogram"] == {"0": 1, "2-3": 1}
+        assert summary["mean"] == 1.5
+
+    def test_sample_stays_bounded(self):
+        sampler = DegreeSampler(max_size=100)
+        for i in range(5000):
+            sampler.add_node(f"node-{i}")
+        assert 0 < len(sampler.degrees) <= 100
+
+
+class TestStatsOption:
+    def test_stats_next_to_outfile(self, tmp_path):
+        outfile = tmp_path / "out.jsonl"
+        result = runner.invoke(cli, [*CONNECTED, "--outfile", str(outfile), "--stats"])
+        assert result.exit_code == 0
+        stats = json.loads((tmp_path / "out.jsonl.stats.json").read_text())
+        assert stats["entities"] == 40
+        assert stats["bytes"] == outfile.stat().st_size
+        assert stats["schemata"]["Person"]["count"] == 20
+        assert stats["schemata"]["Associate"]["count"] == 20
+        assert stats["degree"]["sampled_nodes"] == 20
+        # Every Associate links two people.
+        assert stats["degree"]["mean"] == 2.0
+
+    def test_stats_in_outdir(self, tmp_path):
+        result = runner.invoke(cli, [*CONNECTED, "--outdir", str(tmp_path), "--stats"])
+        assert result.exit_code == 0
+        stats = json.loads((tmp_path / "stats.json").read_text())
+        assert stats["entities"] == 40
+
+    def test_stats_to_stderr_for_stdout(self):
+        result = runner.invoke(cli, [*CONNECTED, "--stats"])
+        assert result.exit_code == 0
+        assert len(result.stdout.strip().splitlines()) == 40
+        assert json.loads(result.stderr)["entities"] == 40
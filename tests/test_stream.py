@@ -0,0 +1,117 @@
+import json
+
+from click.testing import CliRunner
+
+from ftm_random import main
+from ftm_random.main import cli
+
+runner = CliRunner()
+
+
+def parse_output(result):
+    """Parse JSONL output into a list of entity dicts."""
+    return [json.loads(line) for line in result.stdout.strip().splitlines()]
+
+
+class TestStream:
+    def test_stops_after_count(self):
+        result = runner.invoke(
+            cli, ["stream", "--rate", "10000", "--count", "25", "--burst", "4"]
+        )
+        assert result.exit_code == 0
+        assert len(parse_output(result)) == 25
+
+    def test_edges_link_to_earlier_nodes(self):
+        result = runner.invoke(
+            cli,
+            [
+                "stream",
+                "--schema",
+                "Person",
+                "--schema",
+                "Company",
+                "--schema",
+                "Directorship",
+                "--rate",
+                "10000",
+                "--count",
+                "60",
+            ],
+        )
+        assert result.exit_code == 0
+        seen = set()
+        for e in parse_output(result):
+            if e["schema"] == "Directorship":
+                assert e["properties"]["director"][0] in seen
+                assert e["properties"]["organization"][0] in seen
+            else:
+                seen.add(e["id"])
+
+    def test_error_edge_without_compatible_node(self):
+        result = runner.invoke(
+            cli,
+            [
+                "stream",
+                "--schema",
+                "Person",
+                "--schema",
+                "Directorship",
+                "--count",
+                "1",
+            ],
+        )
+        assert result.exit_code != 0
+        assert (
+            "Directorship:organization needs a node schema of type Organization"
+            in result.output
+        )
+
+    def test_reports_throughput(self):
+        result = runner.invoke(cli, ["stream", "--rate", "10000", "--count", "5"])
+        assert result.exit_code == 0
+        assert "Emitted 5 entities" in result.stderr
+        assert "entities/sec" in result.stderr
+
+    def test_error_no_edge_schema(self):
+        result = runner.invoke(cli, ["stream", "--schema", "Person", "--count", "1"])
+        assert result.exit_code != 0
+        assert "edge schema" in result.output
+
+    def test_rejects_non_positive_rate(self):
+        result = runner.invoke(cli, ["stream", "--rate", "0", "--count", "1"])
+        assert result.exit_code != 0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def perf_counter(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestStreamPacing:
+    def test_no_burst_after_stall(self, monkeypatch):
+        clock = FakeClock()
+        generate = main.generate_random_entity
+        times = []
+
+        def slow_generate(*args, **kwargs):
+            # The first entity pays for loading, the tenth hits a long stall.
+            if len(times) in (0, 10):
+                clock.now += 5.0
+            times.append(clock.now)
+            return generate(*args, **kwargs)
+
+        monkeypatch.setattr(main, "time", clock)
+        monkeypatch.setattr(main, "generate_random_entity", slow_generate)
+        result = runner.invoke(cli, ["stream", "--rate", "10", "--count", "30"])
+        assert result.exit_code == 0
+
+        # At 10/sec each entity gets its own 0.1s slot; catching up after the
+        # stall may share at most one slot between two entities.
+        for i in range(2, len(times) - 1):
+            assert times[i + 1] - times[i - 1] >= 0.1 - 1e-9